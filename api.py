@@ -1,207 +1,328 @@
-from fmpsdk import fmp
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional, Union
+import asyncio
+import contextlib
+import functools
 import logging
+import time
 
+from cache import cached
 from config import config
+import fmp_async
 from models import (
-    EarningsReport, IndicatorOutput, IndicatorValue, AnalystConsensus,
+    EarningsReport, IndicatorOutput, AnalystConsensus,
     InsiderActivity, EarningsCalendarEvent, AnalystRating
 )
 
 logger = logging.getLogger(__name__)
 
-def get_eps_surprise(symbol: str) -> List[EarningsReport]:
+class InvalidDateError(ValueError):
+    """A caller-supplied date is not in YYYY-MM-DD format."""
+
+def _build(model, **fields):
+    """Construct a model, skipping validation unless FMP_VALIDATE is set."""
+    if config.FMP_VALIDATE:
+        return model(**fields)
+    return model.model_construct(**fields)
+
+@functools.lru_cache(maxsize=1)
+def _today_str(ts_bucket: int) -> str:
+    return date.fromtimestamp(ts_bucket).isoformat()
+
+def _today() -> str:
+    """Today's date as YYYY-MM-DD, recomputed at most once per second."""
+    return _today_str(int(time.time()))
+
+def normalize_date(d: Optional[str]) -> Optional[str]:
+    """Validate a caller-supplied date and return it zero-padded as YYYY-MM-DD."""
+    if not d:
+        return d
+    try:
+        # Fast path for the common already-padded form; fromisoformat alone
+        # would also accept compact dates like 20240105
+        if len(d) == 10 and d[4] == d[7] == '-':
+            try:
+                return date.fromisoformat(d).isoformat()
+            except ValueError:
+                pass
+        # strptime also accepts unpadded dates like 2024-1-5, but not 20240105
+        return datetime.strptime(d, "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        raise InvalidDateError(f"Invalid date {d!r}, expected YYYY-MM-DD") from None
+
+def _date_key(d: str) -> int:
+    """
+    Turn a 'YYYY-MM-DD...' string into a YYYYMMDD int for fast range checks.
+
+    Returns -1 for missing or non-numeric dates (e.g. 'TBD') so those rows fall
+    outside every range instead of failing the whole call.
+    """
+    try:
+        return int(d[0:4] + d[5:7] + d[8:10])
+    except (TypeError, ValueError):
+        return -1
+
+async def _aiter(items):
+    """Adapt a plain iterable to an async iterator."""
+    for item in items:
+        yield item
+
+def _fast_build(model, mapped: Dict):
+    """
+    Build a model straight from a dict that holds every one of its fields.
+
+    Skips even model_construct's default filling, so only use it for rows
+    mapped through a complete field table.
+    """
+    obj = model.__new__(model)
+    object.__setattr__(obj, '__dict__', mapped)
+    object.__setattr__(obj, '__pydantic_fields_set__', set(mapped))
+    object.__setattr__(obj, '__pydantic_extra__', None)
+    object.__setattr__(obj, '__pydantic_private__', None)
+    return obj
+
+# (model field, FMP key, default) mappings used to build output models
+_EARNINGS_REPORT_FMP_MAP = (
+    ('symbol', 'symbol', None),
+    ('date', 'date', None),
+    ('eps', 'actualEarningResult', 0.0),
+    ('eps_estimated', 'estimatedEarning', 0.0),
+    ('time', 'time', None),
+    ('revenue', 'revenue', None),
+    ('revenue_estimated', 'revenueEstimated', None),
+    ('surprise', 'surprise', None),
+    ('surprise_percentage', 'surprisePercentage', None),
+    ('quarter', 'quarter', None),
+    ('year', 'year', None),
+)
+
+# symbol is prepended per call so it can default to the requested symbol
+_INSIDER_ACTIVITY_FMP_MAP = (
+    ('filing_date', 'filingDate', ''),
+    ('transaction_date', 'transactionDate', ''),
+    ('reporter_name', 'reporterName', ''),
+    ('reporter_title', 'reporterTitle', ''),
+    ('transaction_type', 'transactionType', ''),
+    ('shares', 'securitiesTransacted', 0),
+    ('price', 'price', None),
+    ('value', 'value', None),
+    ('url', 'link', ''),
+)
+
+_EARNINGS_CALENDAR_FMP_MAP = (
+    ('symbol', 'symbol', ''),
+    ('date', 'date', ''),
+    ('eps', 'eps', None),
+    ('eps_estimated', 'epsEstimated', None),
+    ('time', 'time', None),
+    ('revenue', 'revenue', None),
+    ('revenue_estimated', 'revenueEstimated', None),
+    ('quarter', 'quarter', None),
+    ('year', 'year', None),
+)
+
+@cached(ttl_seconds=3600)
+async def get_eps_surprise(symbol: str) -> List[EarningsReport]:
     """Get earnings surprise data for a symbol."""
     try:
-        raw_data = fmp.earnings_surprises(config.FMP_API_KEY, symbol)
+        raw_data = await fmp_async.earnings_surprises(symbol)
         
         # Convert data to our model format
+        mp = _EARNINGS_REPORT_FMP_MAP
         result = []
         for item in raw_data:
-            # Convert to camel case keys to match our model
-            report = EarningsReport(
-                symbol=item.get('symbol'),
-                date=item.get('date'),
-                eps=item.get('actualEarningResult', 0.0),
-                eps_estimated=item.get('estimatedEarning', 0.0),
-                time=item.get('time'),
-                revenue=item.get('revenue'),
-                revenue_estimated=item.get('revenueEstimated'),
-                surprise=item.get('surprise'),
-                surprise_percentage=item.get('surprisePercentage'),
-                quarter=item.get('quarter'),
-                year=item.get('year')
-            )
-            result.append(report)
+            result.append(_build(EarningsReport, **{field: item.get(key, default) for field, key, default in mp}))
         
         return result
     except Exception as e:
         logger.error(f"Error getting EPS surprise for {symbol}: {str(e)}")
         raise
 
-def get_technical_indicator(symbol: str, indicator: str, time_period: int = 14, 
-                            from_date: Optional[str] = None, to_date: Optional[str] = None) -> IndicatorOutput:
+@cached(ttl_seconds=300)
+async def get_technical_indicator(symbol: str, indicator: str, time_period: int = 14, 
+                                  from_date: Optional[str] = None, to_date: Optional[str] = None) -> IndicatorOutput:
     """Get technical indicator data for a symbol."""
     try:
         # Handle date parameters
+        from_date, to_date = normalize_date(from_date), normalize_date(to_date)
         if not to_date:
-            to_date = datetime.now().strftime("%Y-%m-%d")
+            to_date = _today()
         
         if not from_date:
             # Default to 100 days of data if not specified
-            from_date = (datetime.strptime(to_date, "%Y-%m-%d") - timedelta(days=100)).strftime("%Y-%m-%d")
+            from_date = (date.fromisoformat(to_date) - timedelta(days=100)).isoformat()
         
-        raw_data = fmp.technical_indicators(
-            config.FMP_API_KEY, 
-            symbol, 
-            indicator,
-            time_period
-        )
+        # Prefer computing from locally cached OHLCV data over an FMP call;
+        # indicators_local pulls in numpy, so only import it when configured
+        raw_data = None
+        if config.OHLCV_CACHE_DIR:
+            import indicators_local
+            raw_data = await asyncio.to_thread(indicators_local.compute, symbol, indicator, time_period, to_date)
+        if raw_data is None:
+            raw_data = await fmp_async.technical_indicators(symbol, indicator, time_period)
         
-        # Convert to our model format
+        # All rows of one response use the same value key, so pick it once;
+        # some indicators don't use the indicator name as their key
+        ind_l = indicator.lower()
+        key = None
+        if raw_data:
+            probe = raw_data[0]
+            key = next((k for k in (ind_l, 'value', indicator, 'indicator_value') if k in probe), None)
+            if key is None:
+                raise ValueError(f"No value field for indicator {indicator} in FMP response")
+        
+        # Collect in-range rows column-wise into parallel date/value lists
+        lo, hi = _date_key(from_date), _date_key(to_date)
+        dates = []
         values = []
         for item in raw_data:
-            if indicator.lower() in item:
-                value = item[indicator.lower()]
-            else:
-                # Some indicators use different key names
-                fallback_keys = ['value', indicator, 'indicator_value']
-                value = None
-                for key in fallback_keys:
-                    if key in item:
-                        value = item[key]
-                        break
-                
-                if value is None:
-                    # If we can't find the value, skip this item
-                    continue
-                    
-            values.append(IndicatorValue(
-                date=item.get('date', ''),
-                value=float(value) if value is not None else 0.0
-            ))
-        
-        # Filter by date range
-        filtered_values = [v for v in values if from_date <= v.date <= to_date]
+            # Skip if outside date range
+            row_date = item.get('date', '')
+            if not (lo <= _date_key(row_date) <= hi):
+                continue
+            
+            value = item.get(key)
+            if value is None:
+                # If we can't find the value, skip this item
+                continue
+            
+            dates.append(row_date)
+            values.append(float(value))
         
-        return IndicatorOutput(
+        return _build(
+            IndicatorOutput,
             symbol=symbol,
             indicator=indicator,
             time_period=time_period,
-            values=filtered_values
+            dates=dates,
+            values=values
         )
     except Exception as e:
         logger.error(f"Error getting technical indicator {indicator} for {symbol}: {str(e)}")
         raise
 
-def get_price_targets(symbol: str) -> AnalystConsensus:
+async def get_technical_indicators(symbol: str, indicators: List[str], time_period: int = 14,
+                                   from_date: Optional[str] = None, to_date: Optional[str] = None) -> Dict[str, IndicatorOutput]:
+    """Get several technical indicators for a symbol concurrently."""
+    # Each leg goes through the cached get_technical_indicator, so repeats are free
+    names = list(dict.fromkeys(i.lower() for i in indicators))
+    outputs = await asyncio.gather(
+        *(get_technical_indicator(symbol, name, time_period, from_date, to_date) for name in names)
+    )
+    return dict(zip(names, outputs))
+
+@cached(ttl_seconds=900)
+async def get_price_targets(symbol: str) -> AnalystConsensus:
     """Get price target consensus for a symbol."""
     try:
-        raw_data = fmp.price_target_consensus(config.FMP_API_KEY, symbol)
+        # Fetch consensus and individual analyst ratings concurrently
+        consensus_raw, analyst_raw = await asyncio.gather(
+            fmp_async.price_target_consensus(symbol),
+            fmp_async.price_target(symbol),
+            return_exceptions=True
+        )
+        
+        if isinstance(consensus_raw, BaseException):
+            raise consensus_raw
+        raw_data = consensus_raw
         
         # Handle case where API returns multiple items
         if isinstance(raw_data, list) and len(raw_data) > 0:
             raw_data = raw_data[0]
         
-        # Convert to our model format
-        consensus = AnalystConsensus(
-            symbol=symbol,
-            target_consensus=raw_data.get('targetConsensus', 0.0),
-            target_high=raw_data.get('targetHigh', 0.0),
-            target_low=raw_data.get('targetLow', 0.0),
-            number_of_analysts=raw_data.get('numberOfAnalysts', 0),
-            last_analyst_consensus_date=raw_data.get('lastAnalystConsensusDate', ''),
-            rating_consensus=raw_data.get('ratingConsensus', '')
-        )
-        
-        # Try to get detailed analyst ratings if available
+        # Collect detailed analyst ratings if available
+        ratings = None
         try:
-            analyst_data = fmp.price_target(config.FMP_API_KEY, symbol)
+            if isinstance(analyst_raw, BaseException):
+                raise analyst_raw
             ratings = []
             
-            for item in analyst_data:
+            for item in analyst_raw:
                 ratings.append(AnalystRating(
                     analyst_name=item.get('analystName', 'Unknown'),
                     date=item.get('date', ''),
                     rating=item.get('rating', ''),
                     price_target=item.get('priceTarget', 0.0)
                 ))
-            
-            consensus.ratings = ratings
         except Exception:
             # Individual analyst ratings are optional
-            pass
+            ratings = None
+        
+        # Convert to our model format
+        consensus = AnalystConsensus(
+            symbol=symbol,
+            target_consensus=raw_data.get('targetConsensus', 0.0),
+            target_high=raw_data.get('targetHigh', 0.0),
+            target_low=raw_data.get('targetLow', 0.0),
+            number_of_analysts=raw_data.get('numberOfAnalysts', 0),
+            last_analyst_consensus_date=raw_data.get('lastAnalystConsensusDate', ''),
+            rating_consensus=raw_data.get('ratingConsensus', ''),
+            ratings=ratings
+        )
             
         return consensus
     except Exception as e:
         logger.error(f"Error getting price targets for {symbol}: {str(e)}")
         raise
 
-def get_insider_trading(symbol: str, page: int = 0, limit: int = 100) -> List[InsiderActivity]:
+@cached(ttl_seconds=600)
+async def get_insider_trading(symbol: str, page: int = 0, limit: int = 100) -> List[InsiderActivity]:
     """Get insider trading data for a symbol."""
     try:
-        raw_data = fmp.insider_trading(config.FMP_API_KEY, symbol, page=page, limit=limit)
+        raw_data = await fmp_async.insider_trading(symbol, page=page, limit=limit)
         
         # Convert to our model format
+        mp = (('symbol', 'symbol', symbol),) + _INSIDER_ACTIVITY_FMP_MAP
+        fast = not config.FMP_VALIDATE
         result = []
         for item in raw_data:
-            activity = InsiderActivity(
-                symbol=item.get('symbol', symbol),
-                filing_date=item.get('filingDate', ''),
-                transaction_date=item.get('transactionDate', ''),
-                reporter_name=item.get('reporterName', ''),
-                reporter_title=item.get('reporterTitle', ''),
-                transaction_type=item.get('transactionType', ''),
-                shares=item.get('acquistionOrDisposition', 0),
-                price=item.get('price'),
-                value=item.get('value'),
-                url=item.get('link', '')
-            )
-            result.append(activity)
+            mapped = {field: item.get(key, default) for field, key, default in mp}
+            mapped['shares'] = int(mapped['shares'] or 0)
+            result.append(_fast_build(InsiderActivity, mapped) if fast else InsiderActivity(**mapped))
         
         return result
     except Exception as e:
         logger.error(f"Error getting insider trading for {symbol}: {str(e)}")
         raise
 
-def get_earnings_calendar(from_date: Optional[str] = None, to_date: Optional[str] = None, 
-                          symbol: Optional[str] = None) -> List[EarningsCalendarEvent]:
+@cached(ttl_seconds=1800)
+async def get_earnings_calendar(from_date: Optional[str] = None, to_date: Optional[str] = None, 
+                                symbol: Optional[str] = None) -> List[EarningsCalendarEvent]:
     """Get earnings calendar events."""
     try:
         # Handle date parameters
-        if not to_date:
-            to_date = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
-        
-        if not from_date:
-            from_date = datetime.now().strftime("%Y-%m-%d")
-        
-        # If symbol is provided, use the symbol-specific endpoint
+        from_date, to_date = normalize_date(from_date), normalize_date(to_date)
         if symbol:
-            raw_data = fmp.earnings_calendar_confirmed(config.FMP_API_KEY, symbol)
+            # The symbol-specific endpoint returns the full history, so only
+            # filter it by dates the caller actually asked for
+            raw_data = _aiter(await fmp_async.historical_earnings_calendar(symbol))
+            lo = _date_key(from_date) if from_date else 0
+            hi = _date_key(to_date) if to_date else 99999999
         else:
-            raw_data = fmp.earnings_calendar(config.FMP_API_KEY, from_date=from_date, to_date=to_date)
+            if not to_date:
+                to_date = (date.fromisoformat(_today()) + timedelta(days=30)).isoformat()
+            
+            if not from_date:
+                from_date = _today()
+            
+            # The full calendar can be huge, so stream and filter it row by row
+            raw_data = fmp_async.iter_earnings_calendar(from_date, to_date)
+            lo, hi = _date_key(from_date), _date_key(to_date)
         
         # Convert to our model format
+        mp = _EARNINGS_CALENDAR_FMP_MAP
+        fast = not config.FMP_VALIDATE
         result = []
-        for item in raw_data:
-            # Skip if outside date range
-            event_date = item.get('date', '')
-            if event_date < from_date or event_date > to_date:
-                continue
-                
-            event = EarningsCalendarEvent(
-                symbol=item.get('symbol', ''),
-                date=event_date,
-                eps=item.get('eps'),
-                eps_estimated=item.get('epsEstimated'),
-                time=item.get('time'),
-                revenue=item.get('revenue'),
-                revenue_estimated=item.get('revenueEstimated'),
-                quarter=item.get('quarter'),
-                year=item.get('year')
-            )
-            result.append(event)
+        # Close the stream even if a row fails, so its connection and _fmp_sem slot are released
+        async with contextlib.aclosing(raw_data):
+            async for item in raw_data:
+                # Skip if outside date range
+                event_date = item.get('date', '')
+                if not (lo <= _date_key(event_date) <= hi):
+                    continue
+
+                mapped = {field: item.get(key, default) for field, key, default in mp}
+                result.append(_fast_build(EarningsCalendarEvent, mapped) if fast else EarningsCalendarEvent(**mapped))
         
         return result
     except Exception as e:
@@ -0,0 +1,89 @@
+import asyncio
+import functools
+import time
+from typing import Any, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """Collapse concurrent calls sharing a key into one awaited call."""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn, *args, **kwargs) -> Any:
+        """Await fn once for all concurrent callers using the same key."""
+        task = self._inflight.get(key)
+        if task is None:
+            # Run the shared work in its own task so cancelling any one caller,
+            # including the first, never cancels it for the others
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._done, key))
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+
+class AsyncTTLCache:
+    """In-process TTL cache with single-flight deduplication of concurrent misses."""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._flight = SingleFlight()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (hit, value) for a key, dropping it if expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return False, None
+        return True, value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float) -> None:
+        """Store a value, evicting expired or oldest entries when full."""
+        if key not in self._data and len(self._data) >= self.maxsize:
+            now = time.monotonic()
+            for k in [k for k, (exp, _) in self._data.items() if exp <= now]:
+                del self._data[k]
+            if len(self._data) >= self.maxsize:
+                del self._data[next(iter(self._data))]
+        self._data[key] = (time.monotonic() + ttl_seconds, value)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    async def get_or_call(self, key: Hashable, ttl_seconds: float, fn, *args, **kwargs) -> Any:
+        """Return the cached value for key, or await fn once for all concurrent callers."""
+        hit, value = self.get(key)
+        if hit:
+            return value
+        return await self._flight.do(key, self._load, key, ttl_seconds, fn, *args, **kwargs)
+
+    async def _load(self, key: Hashable, ttl_seconds: float, fn, *args, **kwargs) -> Any:
+        value = await fn(*args, **kwargs)
+        self.set(key, value, ttl_seconds)
+        return value
+
+
+_cache = AsyncTTLCache(maxsize=4096)
+
+
+def cached(ttl_seconds: float):
+    """Cache the result of an async function keyed by its name and arguments."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+            return await _cache.get_or_call(key, ttl_seconds, fn, *args, **kwargs)
+        wrapper.cache = _cache
+        return wrapper
+    return decorator
@@ -10,8 +10,24 @@ class Config:
     if not FMP_API_KEY:
         raise ValueError("FMP_API_KEY environment variable not set")
 
+    # Validate FMP responses against the output models (slower, for debugging)
+    FMP_VALIDATE = os.getenv("FMP_VALIDATE", "").lower() in ("1", "true", "yes")
+
+    # Directory of <SYMBOL>.json price histories used to compute RSI/SMA locally
+    OHLCV_CACHE_DIR = os.getenv("OHLCV_CACHE_DIR")
+
+    # Shared FMP HTTP connection pool
+    FMP_MAX_CONNECTIONS = int(os.getenv("FMP_MAX_CONNECTIONS", "100"))
+    FMP_MAX_KEEPALIVE = int(os.getenv("FMP_MAX_KEEPALIVE", "32"))
+    FMP_KEEPALIVE_EXPIRY = float(os.getenv("FMP_KEEPALIVE_EXPIRY", "60"))
+    # Max concurrent FMP requests per worker; size to your FMP plan's rate limit
+    FMP_MAX_INFLIGHT = int(os.getenv("FMP_MAX_INFLIGHT", "8"))
+
     # Server config
     HOST = os.getenv("HOST", "0.0.0.0")
     PORT = int(os.getenv("PORT", "8080"))
+    # Each worker keeps its own response cache, connection pool and
+    # FMP_MAX_INFLIGHT budget, so total FMP concurrency is WORKERS x FMP_MAX_INFLIGHT
+    WORKERS = int(os.getenv("WORKERS", "1"))
 
 config = Config()
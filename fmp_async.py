@@ -0,0 +1,143 @@
+"""
+Async client for the Financial Modeling Prep REST API.
+
+All requests share one pooled httpx.AsyncClient so concurrent MCP tool
+calls overlap their network I/O instead of blocking the event loop, and
+idle keepalive connections are reused so calls skip the TCP+TLS handshake.
+At most FMP_MAX_INFLIGHT requests run at once, identical concurrent requests
+share one call, and 429 responses are retried with jittered backoff.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict
+
+import httpx
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+from cache import SingleFlight
+from config import config
+
+BASE_URL = "https://financialmodelingprep.com/api"
+
+_client = httpx.AsyncClient(
+    base_url=BASE_URL,
+    http2=True,
+    limits=httpx.Limits(
+        max_connections=config.FMP_MAX_CONNECTIONS,
+        max_keepalive_connections=config.FMP_MAX_KEEPALIVE,
+        keepalive_expiry=config.FMP_KEEPALIVE_EXPIRY,
+    ),
+    timeout=15,
+)
+
+class FMPError(Exception):
+    """An FMP request failed. Carries only the status code and path, never the API key."""
+
+    def __init__(self, status_code: int, path: str):
+        self.status_code = status_code
+        self.path = path
+        super().__init__(f"FMP request to {path} failed with HTTP {status_code}")
+
+_fmp_sem = asyncio.Semaphore(config.FMP_MAX_INFLIGHT)
+_flight = SingleFlight()
+
+def _is_rate_limited(exc: BaseException) -> bool:
+    return isinstance(exc, FMPError) and exc.status_code == 429
+
+_retry_rate_limited = retry(
+    retry=retry_if_exception(_is_rate_limited),
+    stop=stop_after_attempt(4),
+    wait=wait_exponential_jitter(initial=0.5, max=8),
+    reraise=True,
+)
+
+@_retry_rate_limited
+async def _fetch(path: str, params: Dict[str, Any]) -> Any:
+    # The semaphore is released while tenacity sleeps between attempts
+    async with _fmp_sem:
+        r = await _client.get(path, params=params)
+        # Not raise_for_status(): its message includes the URL and so the API key
+        if r.is_error:
+            raise FMPError(r.status_code, path)
+        return r.json()
+
+async def _get(path: str, **params) -> Any:
+    """GET an FMP endpoint and return the decoded JSON body."""
+    key = (path, tuple(sorted(params.items())))
+    params["apikey"] = config.FMP_API_KEY
+    return await _flight.do(key, _fetch, path, params)
+
+async def aclose() -> None:
+    """Close the shared client and its pooled connections."""
+    await _client.aclose()
+
+async def earnings_surprises(symbol: str) -> Any:
+    return await _get(f"/v3/earnings-surprises/{symbol}")
+
+async def technical_indicators(symbol: str, indicator: str, period: int, time_delta: str = "daily") -> Any:
+    return await _get(f"/v3/technical_indicator/{time_delta}/{symbol}", type=indicator, period=period)
+
+async def price_target_consensus(symbol: str) -> Any:
+    return await _get("/v4/price-target-consensus", symbol=symbol)
+
+async def price_target(symbol: str) -> Any:
+    return await _get("/v4/price-target", symbol=symbol)
+
+async def insider_trading(symbol: str, page: int = 0, limit: int = 100) -> Any:
+    return await _get("/v4/insider-trading", symbol=symbol, page=page, limit=limit)
+
+@_retry_rate_limited
+async def _open_stream(path: str, params: Dict[str, Any]) -> httpx.Response:
+    """
+    Open a streaming GET holding one _fmp_sem slot.
+
+    On success the caller must close the response and release the slot. On
+    error both are released here, so tenacity's backoff does not hold a slot.
+    """
+    await _fmp_sem.acquire()
+    try:
+        r = await _client.send(_client.build_request("GET", path, params=params), stream=True)
+    except BaseException:
+        _fmp_sem.release()
+        raise
+    if r.is_error:
+        await r.aclose()
+        _fmp_sem.release()
+        raise FMPError(r.status_code, path)
+    return r
+
+async def iter_earnings_calendar(from_date: str, to_date: str) -> AsyncIterator[Dict[str, Any]]:
+    """Stream earnings calendar rows one at a time instead of buffering the whole body."""
+    import ijson
+
+    params = {"from": from_date, "to": to_date, "apikey": config.FMP_API_KEY}
+    r = await _open_stream("/v3/earning_calendar", params)
+    try:
+        rows = ijson.sendable_list()
+        parser = ijson.items_coro(rows, "item", use_float=True)
+        checked = False
+        chunks = r.aiter_bytes()
+        async for chunk in chunks:
+            if not checked:
+                # FMP reports errors such as rate limits as a JSON object, which
+                # would otherwise parse as zero rows; require a top-level array
+                head = chunk.lstrip()
+                if not head:
+                    continue
+                if not head.startswith(b"["):
+                    body = chunk + b"".join([c async for c in chunks])
+                    raise ValueError(f"Unexpected FMP earnings calendar response: {body[:200].decode(errors='replace')}")
+                checked = True
+            parser.send(chunk)
+            for row in rows:
+                yield row
+            del rows[:]
+        parser.close()
+        for row in rows:
+            yield row
+    finally:
+        await r.aclose()
+        _fmp_sem.release()
+
+async def historical_earnings_calendar(symbol: str) -> Any:
+    return await _get(f"/v3/historical/earning_calendar/{symbol}")
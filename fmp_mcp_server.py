@@ -5,20 +5,24 @@ FMP MCP Server
 A MCP server for Financial Modeling Prep API using fastmcp.
 """
 
+import asyncio
 import logging
-import uvicorn
+import orjson
 from fastapi import FastAPI, HTTPException, Query, Depends
+from fastapi.responses import ORJSONResponse
 from fastmcp import Server, Tool, Annotated
-from typing import List, Optional
+from pydantic import BaseModel
+from typing import Dict, List, Optional, Union
 import json
 
 from config import config
 from models import (
     SymbolInput, TechnicalIndicatorInput, EarningsCalendarInput,
-    PriceTargetInput, InsiderTradingInput, EarningsReport, IndicatorOutput,
+    PriceTargetInput, InsiderTradingInput, EarningsReport, IndicatorOutput, LegacyIndicatorOutput,
     AnalystConsensus, InsiderActivity, EarningsCalendarEvent
 )
 import api
+import fmp_async
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,11 +32,28 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+def _orjson_default(obj):
+    """Serialize Pydantic models that reach the encoder unconverted."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+class MCPJSONResponse(ORJSONResponse):
+    """orjson response that also understands Pydantic models."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_orjson_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+        )
+
 app = FastAPI(
     title="FMP MCP Server",
     description="""Model Context Protocol (MCP) server for Financial Modeling Prep data.
     Provides structured financial data for trading strategies.""",
-    version="1.0.0",
+    version="1.1.0",
+    default_response_class=MCPJSONResponse,
 )
 
 server = Server(app=app, path="/mcp")
@@ -46,7 +67,7 @@ async def get_eps_surprise(symbol: Annotated[str, "The stock symbol to fetch ear
     for the specified symbol. Critical for PEAD strategy implementation.
     """
     try:
-        return api.get_eps_surprise(symbol)
+        return await api.get_eps_surprise(symbol)
     except Exception as e:
         logger.error(f"Error in get_eps_surprise: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching EPS surprise data: {str(e)}")
@@ -57,7 +78,7 @@ async def get_rsi(
     time_period: Annotated[int, "Time period for RSI calculation"] = 14,
     from_date: Annotated[Optional[str], "Start date in YYYY-MM-DD format"] = None,
     to_date: Annotated[Optional[str], "End date in YYYY-MM-DD format"] = None
-) -> IndicatorOutput:
+) -> LegacyIndicatorOutput:
     """
     Get Relative Strength Index (RSI) data for a symbol.
     
@@ -65,7 +86,10 @@ async def get_rsi(
     technical analysis and backtesting.
     """
     try:
-        return api.get_technical_indicator(symbol, "rsi", time_period, from_date, to_date)
+        output = (await api.get_technical_indicators(symbol, ["rsi"], time_period, from_date, to_date))["rsi"]
+        return LegacyIndicatorOutput.from_columnar(output)
+    except api.InvalidDateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in get_rsi: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching RSI data: {str(e)}")
@@ -76,7 +100,7 @@ async def get_sma(
     time_period: Annotated[int, "Time period for SMA calculation"] = 20,
     from_date: Annotated[Optional[str], "Start date in YYYY-MM-DD format"] = None,
     to_date: Annotated[Optional[str], "End date in YYYY-MM-DD format"] = None
-) -> IndicatorOutput:
+) -> LegacyIndicatorOutput:
     """
     Get Simple Moving Average (SMA) data for a symbol.
     
@@ -84,11 +108,79 @@ async def get_sma(
     technical analysis and backtesting.
     """
     try:
-        return api.get_technical_indicator(symbol, "sma", time_period, from_date, to_date)
+        output = (await api.get_technical_indicators(symbol, ["sma"], time_period, from_date, to_date))["sma"]
+        return LegacyIndicatorOutput.from_columnar(output)
+    except api.InvalidDateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in get_sma: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching SMA data: {str(e)}")
 
+@server.tool("get_indicators")
+async def get_indicators(
+    symbol: Annotated[str, "The stock symbol to fetch indicator data for"],
+    indicators: Annotated[List[str], "Indicator types (e.g. ['rsi', 'sma'])"],
+    time_period: Annotated[int, "Time period for the indicator calculation"] = 14,
+    from_date: Annotated[Optional[str], "Start date in YYYY-MM-DD format"] = None,
+    to_date: Annotated[Optional[str], "End date in YYYY-MM-DD format"] = None
+) -> Dict[str, IndicatorOutput]:
+    """
+    Get several technical indicators for a symbol at once.
+    
+    Fetches all requested indicators concurrently and returns a mapping of
+    indicator name to output. Useful when a strategy needs e.g. RSI and SMA
+    for the same symbol and window.
+    """
+    try:
+        return await api.get_technical_indicators(symbol, indicators, time_period, from_date, to_date)
+    except api.InvalidDateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in get_indicators: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error fetching indicator data: {str(e)}")
+
+@server.tool("get_technical_indicator_batch")
+async def get_technical_indicator_batch(
+    symbols: Annotated[List[str], "The stock symbols to fetch indicator data for"],
+    indicator: Annotated[str, "Indicator type (e.g. 'rsi', 'sma')"],
+    time_period: Annotated[int, "Time period for the indicator calculation"] = 14,
+    from_date: Annotated[Optional[str], "Start date in YYYY-MM-DD format"] = None,
+    to_date: Annotated[Optional[str], "End date in YYYY-MM-DD format"] = None
+) -> Dict[str, Union[IndicatorOutput, Dict[str, str]]]:
+    """
+    Get a technical indicator for several symbols at once.
+    
+    Fetches all symbols concurrently and returns a mapping of symbol to
+    indicator output. Symbols that fail map to an error message instead of
+    failing the whole batch. Useful for screening a watchlist.
+    """
+    try:
+        api.normalize_date(from_date)
+        api.normalize_date(to_date)
+    except api.InvalidDateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    sem = asyncio.Semaphore(16)
+    # Lowercase so "RSI" and "rsi" share cache entries with the other indicator tools
+    indicator = indicator.lower()
+    
+    async def one(symbol):
+        async with sem:
+            return await api.get_technical_indicator(symbol, indicator, time_period, from_date, to_date)
+    
+    results = await asyncio.gather(*(one(s) for s in symbols), return_exceptions=True)
+    
+    output = {}
+    for symbol, result in zip(symbols, results):
+        if isinstance(result, asyncio.CancelledError):
+            raise result
+        if isinstance(result, BaseException):
+            logger.error(f"Error in get_technical_indicator_batch for {symbol}: {str(result)}")
+            output[symbol] = {"error": str(result)}
+        else:
+            output[symbol] = result
+    return output
+
 @server.tool("get_price_targets")
 async def get_price_targets(symbol: Annotated[str, "The stock symbol to fetch price targets for"]) -> AnalystConsensus:
     """
@@ -98,7 +190,7 @@ async def get_price_targets(symbol: Annotated[str, "The stock symbol to fetch pr
     Important for long-term risk filters and analyst extreme detection.
     """
     try:
-        return api.get_price_targets(symbol)
+        return await api.get_price_targets(symbol)
     except Exception as e:
         logger.error(f"Error in get_price_targets: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching price target data: {str(e)}")
@@ -116,7 +208,7 @@ async def get_insider_trading(
     type, shares, price, and value. Useful for news-halt heuristics on large insider sales.
     """
     try:
-        return api.get_insider_trading(symbol, page, limit)
+        return await api.get_insider_trading(symbol, page, limit)
     except Exception as e:
         logger.error(f"Error in get_insider_trading: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching insider trading data: {str(e)}")
@@ -131,20 +223,27 @@ async def get_earnings_calendar(
     Get earnings calendar events.
     
     Returns upcoming earnings events in the specified date range. Optionally filter
-    by symbol. Useful for PEAD strategy and volatility forecasting.
+    by symbol; with a symbol and no dates, all of its known earnings dates are
+    returned. Useful for PEAD strategy and volatility forecasting.
     """
     try:
-        return api.get_earnings_calendar(from_date, to_date, symbol)
+        return await api.get_earnings_calendar(from_date, to_date, symbol)
+    except api.InvalidDateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in get_earnings_calendar: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching earnings calendar data: {str(e)}")
 
+@app.on_event("shutdown")
+async def shutdown():
+    await fmp_async.aclose()
+
 @app.get("/")
 async def root():
     return {
         "name": "FMP MCP Server",
         "description": "Model Context Protocol (MCP) server for Financial Modeling Prep data",
-        "version": "1.0.0",
+        "version": "1.1.0",
         "endpoints": {
             "mcp": "/mcp",
             "docs": "/docs",
@@ -157,5 +256,16 @@ async def health_check():
     return {"status": "healthy", "api_key_configured": bool(config.FMP_API_KEY)}
 
 if __name__ == "__main__":
-    logger.info(f"Starting FMP MCP Server on {config.HOST}:{config.PORT}")
-    uvicorn.run("fmp_mcp_server:app", host=config.HOST, port=config.PORT, reload=True)
+    import sys
+    import uvicorn
+
+    logger.info(f"Starting FMP MCP Server on {config.HOST}:{config.PORT} with {config.WORKERS} worker(s)")
+    uvicorn.run(
+        "fmp_mcp_server:app",
+        host=config.HOST,
+        port=config.PORT,
+        workers=config.WORKERS,
+        # uvloop is not available on Windows
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools"
+    )
@@ -0,0 +1,133 @@
+"""
+Local technical indicator computation from cached OHLCV data.
+
+When OHLCV_CACHE_DIR is set and holds a price history for a symbol,
+indicators are computed in-process instead of calling FMP. The inner
+loops are Numba kernels when numba is installed and plain Python
+otherwise.
+"""
+
+import datetime
+import functools
+import json
+import math
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import config
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda f: f
+
+@njit(cache=True)
+def _sma_loop(close, period):
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    if period <= 0 or n < period:
+        return out
+    total = 0.0
+    for i in range(period):
+        total += close[i]
+    out[period - 1] = total / period
+    for i in range(period, n):
+        total += close[i] - close[i - period]
+        out[i] = total / period
+    return out
+
+@njit(cache=True)
+def _rsi_loop(close, period):
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    if period <= 0 or n <= period:
+        return out
+    gain = 0.0
+    loss = 0.0
+    for i in range(1, period + 1):
+        change = close[i] - close[i - 1]
+        if change > 0:
+            gain += change
+        else:
+            loss -= change
+    avg_gain = gain / period
+    avg_loss = loss / period
+    out[period] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    # Wilder smoothing
+    for i in range(period + 1, n):
+        change = close[i] - close[i - 1]
+        up = change if change > 0 else 0.0
+        down = -change if change < 0 else 0.0
+        avg_gain = (avg_gain * (period - 1) + up) / period
+        avg_loss = (avg_loss * (period - 1) + down) / period
+        out[i] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return out
+
+_KERNELS = {
+    'rsi': _rsi_loop,
+    'sma': _sma_loop,
+}
+
+@functools.lru_cache(maxsize=64)
+def _load_closes(path: str, mtime: float) -> Tuple[List[str], np.ndarray]:
+    with open(path) as f:
+        data = json.load(f)
+    # Accept FMP historical-price-full payloads as well as a bare row list
+    if isinstance(data, dict):
+        data = data.get('historical', [])
+    data = sorted(data, key=lambda row: row['date'])
+    dates = [row['date'] for row in data]
+    closes = np.array([row['close'] for row in data], dtype=np.float64)
+    return dates, closes
+
+def load_ohlcv(symbol: str) -> Optional[Tuple[List[str], np.ndarray]]:
+    """Return (dates, closes) in ascending date order from the local cache, if present."""
+    if not config.OHLCV_CACHE_DIR:
+        return None
+    path = os.path.join(config.OHLCV_CACHE_DIR, f"{symbol.upper()}.json")
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    return _load_closes(path, mtime)
+
+def _last_weekday(d: str) -> str:
+    """Return the latest weekday on or before YYYY-MM-DD d, since markets close on weekends."""
+    day = datetime.date.fromisoformat(d)
+    if day.weekday() >= 5:
+        day -= datetime.timedelta(days=day.weekday() - 4)
+    return day.isoformat()
+
+def compute(symbol: str, indicator: str, time_period: int,
+            to_date: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Compute an indicator from cached OHLCV data.
+
+    Returns rows shaped like FMP's technical_indicator response (newest first),
+    or None if the indicator is not supported locally, the symbol is not cached,
+    the cached history ends before the last weekday up to to_date, or it is too
+    short to produce any values. Reads the file on first use, so call it off
+    the event loop.
+    """
+    key = indicator.lower()
+    kernel = _KERNELS.get(key)
+    if kernel is None:
+        return None
+    ohlcv = load_ohlcv(symbol)
+    if ohlcv is None:
+        return None
+    dates, closes = ohlcv
+    # A stale history would silently truncate the requested window
+    if not dates or (to_date and dates[-1][:10] < _last_weekday(to_date)):
+        return None
+    values = kernel(closes, time_period).tolist()
+    rows = [
+        {'date': d, key: v}
+        for d, v in zip(reversed(dates), reversed(values))
+        if not math.isnan(v)
+    ]
+    # Too short a history for time_period; let the caller fall back to FMP
+    return rows or None
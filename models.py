@@ -1,6 +1,7 @@
 from typing import Dict, List, Optional, Union
 from datetime import datetime, date
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, model_serializer
+from typing_extensions import TypedDict
 
 # Input models
 class SymbolInput(BaseModel):
@@ -33,8 +34,15 @@ class InsiderTradingInput(BaseModel):
     limit: int = Field(default=100, description="Number of results per page")
 
 # Output models
+# Output models are frozen because cached results are shared between callers
+# (the lists they are returned in, and list fields, must not be mutated either).
+# Row models returned in large lists also declare empty __slots__ so instances
+# carry no __weakref__.
 class EarningsReport(BaseModel):
     """Earnings report with surprise data."""
+    model_config = ConfigDict(frozen=True)
+    __slots__ = ()
+
     symbol: str
     date: str
     eps: float
@@ -48,20 +56,47 @@ class EarningsReport(BaseModel):
     quarter: Optional[float] = None
     year: Optional[int] = None
 
-class IndicatorValue(BaseModel):
+class IndicatorOutput(BaseModel):
+    """Technical indicator output, stored column-wise: values[i] is the reading on dates[i]."""
+    model_config = ConfigDict(frozen=True)
+
+    symbol: str
+    indicator: str
+    time_period: int
+    dates: List[str]
+    values: List[float]
+
+class IndicatorValue(TypedDict):
     """Single technical indicator value."""
     date: str
     value: float
 
-class IndicatorOutput(BaseModel):
-    """Technical indicator output."""
+class IndicatorRows(TypedDict):
+    """Row-wise technical indicator output."""
     symbol: str
     indicator: str
     time_period: int
     values: List[IndicatorValue]
 
+class LegacyIndicatorOutput(IndicatorOutput):
+    """Technical indicator output serialized row-wise as values=[{date, value}, ...] for get_rsi/get_sma."""
+
+    @classmethod
+    def from_columnar(cls, output: IndicatorOutput) -> "LegacyIndicatorOutput":
+        return cls.model_construct(**dict(output))
+
+    @model_serializer(mode="wrap")
+    def _serialize_rows(self, handler) -> IndicatorRows:
+        data = handler(self)
+        dates = data.pop("dates")
+        data["values"] = [{"date": d, "value": v} for d, v in zip(dates, data["values"])]
+        return data
+
 class AnalystRating(BaseModel):
     """Individual analyst rating."""
+    model_config = ConfigDict(frozen=True)
+    __slots__ = ()
+
     analyst_name: Optional[str] = None
     date: str
     rating: str
@@ -69,6 +104,8 @@ class AnalystRating(BaseModel):
 
 class AnalystConsensus(BaseModel):
     """Price target consensus data."""
+    model_config = ConfigDict(frozen=True)
+
     symbol: str
     target_consensus: float
     target_high: float
@@ -80,6 +117,9 @@ class AnalystConsensus(BaseModel):
 
 class InsiderActivity(BaseModel):
     """Insider trading activity."""
+    model_config = ConfigDict(frozen=True)
+    __slots__ = ()
+
     symbol: str
     filing_date: str
     transaction_date: str
@@ -93,6 +133,9 @@ class InsiderActivity(BaseModel):
 
 class EarningsCalendarEvent(BaseModel):
     """Earnings calendar event."""
+    model_config = ConfigDict(frozen=True)
+    __slots__ = ()
+
     symbol: str
     date: str
     eps: Optional[float] = None
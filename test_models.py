@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Offline tests for output models and the model construction helpers in api.py.
+
+_fast_build writes pydantic's private instance slots directly, so these
+tests guard against pydantic changing its internal layout.
+"""
+
+import os
+import unittest
+
+os.environ.setdefault("FMP_API_KEY", "test")
+
+import api
+from models import EarningsCalendarEvent, IndicatorOutput, InsiderActivity, LegacyIndicatorOutput
+
+INSIDER_ROW = {
+    'symbol': 'TSLA',
+    'filing_date': '2024-01-02',
+    'transaction_date': '2024-01-01',
+    'reporter_name': 'Jane Doe',
+    'reporter_title': 'CFO',
+    'transaction_type': 'S-Sale',
+    'shares': 1000,
+    'price': 238.5,
+    'value': None,
+    'url': 'https://www.sec.gov/',
+}
+
+CALENDAR_ROW = {
+    'symbol': 'AAPL',
+    'date': '2024-02-01',
+    'eps': 2.18,
+    'eps_estimated': 2.1,
+    'time': 'amc',
+    'revenue': 119575000000.0,
+    'revenue_estimated': 117900000000.0,
+    'quarter': None,
+    'year': None,
+}
+
+class FastBuildTest(unittest.TestCase):
+    def assert_matches_model_construct(self, model, mapped):
+        fast = api._fast_build(model, dict(mapped))
+        constructed = model.model_construct(**mapped)
+
+        self.assertIsInstance(fast, model)
+        self.assertEqual(fast.model_dump(), constructed.model_dump())
+        self.assertEqual(fast.model_dump_json(), constructed.model_dump_json())
+        self.assertEqual(fast.model_fields_set, constructed.model_fields_set)
+        self.assertEqual(fast, constructed)
+
+    def test_insider_activity(self):
+        self.assert_matches_model_construct(InsiderActivity, INSIDER_ROW)
+
+    def test_earnings_calendar_event(self):
+        self.assert_matches_model_construct(EarningsCalendarEvent, CALENDAR_ROW)
+
+    def test_field_tables_cover_every_field(self):
+        # _fast_build skips default filling, so the maps must be complete
+        insider_fields = {'symbol'} | {f for f, _, _ in api._INSIDER_ACTIVITY_FMP_MAP}
+        calendar_fields = {f for f, _, _ in api._EARNINGS_CALENDAR_FMP_MAP}
+        self.assertEqual(insider_fields, set(InsiderActivity.model_fields))
+        self.assertEqual(calendar_fields, set(EarningsCalendarEvent.model_fields))
+
+class LegacyIndicatorOutputTest(unittest.TestCase):
+    def test_serializes_rows(self):
+        output = IndicatorOutput.model_construct(
+            symbol='NVDA', indicator='rsi', time_period=14,
+            dates=['2024-01-31', '2024-01-30'], values=[61.2, 58.9]
+        )
+        legacy = LegacyIndicatorOutput.from_columnar(output)
+
+        self.assertEqual(legacy.model_dump(), {
+            'symbol': 'NVDA',
+            'indicator': 'rsi',
+            'time_period': 14,
+            'values': [
+                {'date': '2024-01-31', 'value': 61.2},
+                {'date': '2024-01-30', 'value': 58.9},
+            ],
+        })
+        # The columnar output used by the new tools is unchanged
+        self.assertEqual(output.model_dump()['dates'], ['2024-01-31', '2024-01-30'])
+
+if __name__ == "__main__":
+    unittest.main()